@@ -12,6 +12,7 @@ classes = (
     OT_GenerateAnimation,
     PT_MainPanel,
 )
+register_classes, unregister_classes = bpy.utils.register_classes_factory(classes)
 
 def register():
     """
@@ -29,8 +30,7 @@ def register():
         - classes: List of classes to be registered
         - M2V_Properties: Property group class for storing addon properties
     """
-    for cls in classes:
-        bpy.utils.register_class(cls)
+    register_classes()
     bpy.types.Scene.m2b = bpy.props.PointerProperty(type=M2V_Properties)
 
 def unregister():
@@ -44,8 +44,7 @@ def unregister():
     Raises:
         AttributeError: If bpy.types.Scene.m2b or any class fails to unregister
     """
-    for cls in reversed(classes):
-        bpy.utils.unregister_class(cls)
+    unregister_classes()
     del bpy.types.Scene.m2b
 
 if __name__ == "__main__":
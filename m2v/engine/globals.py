@@ -41,6 +41,8 @@ class GlobalState:
         self.master_collection: None
         self.master_loc_collection: None
         self.hidden_collection: None
-        self.f_log: None
+        self.empty_template = None
+        self.master_loc_empties = {}
+        self.f_log = None
 
 glb = GlobalState()
@@ -8,16 +8,32 @@ def delete_collection_recursive(collection):
     """
     Recursively delete a collection and all its child collections and objects.
 
+    The whole tree is gathered first and removed with a single batch_remove call.
+
     Args:
     collection (bpy.types.Collection): The collection to delete.
     """
-    for child in collection.children:
-        delete_collection_recursive(child)
+    bpy.data.batch_remove(ids=[collection, *collection.children_recursive, *collection.all_objects])
 
-    for obj in collection.objects:
-        bpy.data.objects.remove(obj, do_unlink=True)
+def reset_collection(collection, existing=None):
+    """
+    Empty a collection in place, keeping the collection itself alive.
 
-    bpy.data.collections.remove(collection)
+    Child collections are deleted recursively and objects are removed, but the
+    collection keeps its identity so external references (drivers, constraints)
+    still target it.
+
+    Args:
+    collection (bpy.types.Collection): The collection to empty.
+    existing (set): Optional set of known collection names, kept up to date.
+    """
+    children = collection.children_recursive
+    if existing is not None:
+        existing.difference_update(child.name for child in children)
+
+    ids = [*children, *collection.all_objects]
+    if ids:
+        bpy.data.batch_remove(ids=ids)
 
 def find_collection(context, item):
     """
@@ -40,56 +56,106 @@ def move_to_collection(collection, obj):
     collection.objects.link(obj)
     collect_to_unlink.objects.unlink(obj)
 
-    master_loc_name = f"{collection.name}_MasterLocation"
-    mlc = glb.master_loc_collection  # master location collection
-    if mlc and master_loc_name in mlc.objects:
-        obj.parent = mlc.objects[master_loc_name]
+    parent_empty = glb.master_loc_empties.get(collection.name)
+    if parent_empty is not None:
+        obj.parent = parent_empty
 
-def create_collection(col_name, col_parent, empty_loc_master=True):
+def get_empty_template():
+    """
+    Return the shared empty used as template for master location empties.
+    The template is not linked to any collection, copies of it are.
+    """
+    if glb.empty_template is None:
+        template = bpy.data.objects.get("MasterLocationTemplate")
+        if template is None:
+            template = bpy.data.objects.new("MasterLocationTemplate", None)
+            template.empty_display_type = 'PLAIN_AXES'
+        glb.empty_template = template
+    return glb.empty_template
+
+def create_collection(col_name, col_parent, empty_loc_master=True, existing=None):
     """
     This function creates a new collection under a specified parent collection.
+    If the collection already exists under that parent, it is emptied and reused as is.
+    A collection of the same name found anywhere else is deleted first, as it is not
+    part of the M2V tree.
+    An optional set of known collection names can be given as existing, names
+    missing from it skip the bpy.data.collections lookup.
     """
-    if col_name in bpy.data.collections:
-        collection = bpy.data.collections[col_name]
-        delete_collection_recursive(collection)
-
-    new_collection = bpy.data.collections.new(col_name)
-    col_parent.children.link(new_collection)
-
-    if empty_loc_master:
-        bpy.ops.object.empty_add(type='PLAIN_AXES', location=(0, 0, 0))
-        empty = bpy.context.active_object
+    if existing is None or col_name in existing:
+        collection = bpy.data.collections.get(col_name)
+    else:
+        collection = None
+
+    if collection is not None and col_parent.children.get(col_name) == collection:
+        reset_collection(collection, existing)
+    else:
+        if collection is not None:
+            # Other scene, orphan or user collection, the new one must get the exact name
+            if existing is not None:
+                existing.difference_update(
+                    child.name for child in (collection, *collection.children_recursive)
+                )
+            delete_collection_recursive(collection)
+
+        collection = bpy.data.collections.new(col_name)
+        col_parent.children.link(collection)
+        if existing is not None:
+            existing.add(collection.name)
+
+    if empty_loc_master and collection.name not in glb.master_loc_empties:
+        empty = get_empty_template().copy()
         empty.name = f"{col_name}_MasterLocation"
 
-        parent_empty_name = f"{col_parent.name}_MasterLocation"
+        parent_empty = glb.master_loc_empties.get(col_parent.name)
+        if parent_empty is not None:
+            empty.parent = parent_empty
 
-        if parent_empty_name in glb.master_loc_collection.objects:
-            empty.parent = glb.master_loc_collection.objects[parent_empty_name]
+        # The copy is not linked anywhere yet
+        glb.master_loc_collection.objects.link(empty)
+        glb.master_loc_empties[collection.name] = empty
 
-        move_to_collection(glb.master_loc_collection, empty)
+    return collection
 
-    return new_collection
+def find_master_parent(scene_col, master_name):
+    """
+    Return the parent for the master collection, found by name: the collection that
+    already holds master_name in the scene tree, so a re-run keeps it in place.
+    On a first run, the first child of the scene collection (the default "Collection"),
+    or the scene collection itself when it has no children.
+    """
+    for collection in (scene_col, *scene_col.children_recursive):
+        if master_name in collection.children:
+            return collection
+    return scene_col.children[0] if scene_col.children else scene_col
 
 def init_collections():
     """
     Initialize global variables that require Blender context
     """
-    col_default = bpy.context.scene.collection.children[0]
+    glb.empty_template = None
+    glb.master_loc_empties = {}
+    existing = set(bpy.data.collections.keys())
+
+    scene_col = bpy.context.scene.collection
+    col_default = find_master_parent(scene_col, "M2V")
 
-    glb.master_collection = create_collection("M2V", col_default, False)
+    glb.master_collection = create_collection("M2V", col_default, False, existing)
 
     master_col = glb.master_collection
 
     glb.master_loc_collection = create_collection(
-        "MasterLocation", 
+        "MasterLocation",
         master_col,
-        False
+        False,
+        existing
     )
 
     glb.hidden_collection = create_collection(
-        "Hidden", 
+        "Hidden",
         master_col,
-        False
+        False,
+        existing
     )
 
     glb.hidden_collection.hide_viewport = True
@@ -18,32 +18,62 @@ TODO:
 
 from dataclasses import dataclass, field
 from typing import List
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import groupby
+from operator import attrgetter
 import struct
-import mmap
-from os import SEEK_CUR
+import sys
+from os import SEEK_CUR, SEEK_SET
+import numpy as np
 
-def evaluate_envelope(time, time_on, time_off, attack_time, attack_interpolation,
-    decay_time, decay_interpolation, sustain_level):
+# Precompiled unpackers, the format strings are parsed only once
+_U16BE = struct.Struct(">H").unpack
+_U32BE = struct.Struct(">I").unpack
+
+def _read_text(memory_map, length):
+    return memory_map.read(length).decode("latin-1")
+
+def _read_name(memory_map, length):
+    # Track, instrument, program and device names repeat across tracks, share them
+    return sys.intern(memory_map.read(length).decode("latin-1"))
+
+@lru_cache(maxsize=8)
+def _compile_evaluator(attack_time, attack_interpolation, decay_time, decay_interpolation,
+    sustain_level, release_time, release_interpolation, velocity_sensitivity):
     """
-    find either point in time for envelope or where in envelope the time_off happened
+    ADSR envelope of a note, with release and velocity blend, for one set of
+    envelope parameters. This is the only implementation of the formula, used by
+    MIDINote.evaluate, MIDITrack.evaluate and MIDITrack.evaluate_all.
+    A render evaluates every frame with the same parameters, so the returned
+    evaluator(time, time_on, time_off, velocity) is cached and only takes the
+    per note values, the constant parts of the formula are computed once.
     """
-    relative_time = min(time, time_off) - time_on
+    sustain_range = 1 - sustain_level
+    direct_level = 1 - velocity_sensitivity
 
-    if relative_time <= 0.0:
-        return 0.0
+    def evaluator(time, time_on, time_off, velocity):
+        relative_time = (time if time < time_off else time_off) - time_on
 
-    if relative_time < attack_time:
-        return attack_interpolation(relative_time / attack_time)
+        if relative_time <= 0.0:
+            value = 0.0
+        elif relative_time < attack_time:
+            value = attack_interpolation(relative_time / attack_time)
+        else:
+            relative_time = relative_time - attack_time
+            if relative_time < decay_time:
+                value = decay_interpolation(1 - relative_time / decay_time) * sustain_range + sustain_level
+            else:
+                value = sustain_level
 
-    relative_time = relative_time - attack_time
+        if time > time_off:
+            value = value * release_interpolation(1 - ((time - time_off) / release_time))
 
-    if relative_time < decay_time:
-        decay_normalized = decay_interpolation(1 - relative_time / decay_time)
-        return decay_normalized * (1 - sustain_level) + sustain_level
+        return direct_level * value + velocity_sensitivity * velocity * value
 
-    return sustain_level
+    return evaluator
 
-@dataclass
+@dataclass(slots=True)
 class MIDINote:
     """
     This class stores essential MIDI note data and provides functionality to evaluate
@@ -80,15 +110,12 @@ class MIDINote:
             float: The calculated envelope value at the given time,
             incorporating velocity sensitivity
         """
-        value = evaluate_envelope(time, self.time_on, self.time_off, attack_time,
-                attack_interpolation, decay_time, decay_interpolation, sustain_level)
-
-        if time > self.time_off:
-            value = value * release_interpolation(1 - ((time - self.time_off) / release_time))
-
         # if velocity sensitivity is 25%, then take 75% of envelope
         # and 25% of envelope with velocity
-        return (1 - velocity_sensitivity) * value + velocity_sensitivity * self.velocity * value
+        evaluator = _compile_evaluator(attack_time, attack_interpolation, decay_time,
+            decay_interpolation, sustain_level, release_time, release_interpolation,
+            velocity_sensitivity)
+        return evaluator(time, self.time_on, self.time_off, self.velocity)
 
     def copy(self):
         """
@@ -99,7 +126,7 @@ class MIDINote:
         """
         return MIDINote(self.channel, self.note_number, self.time_on, self.time_off, self.velocity)
 
-@dataclass
+@dataclass(slots=True)
 class MIDITrackUsed:
     """
     This class holds information about a MIDI track including its index number,
@@ -115,7 +142,11 @@ class MIDITrackUsed:
     note_count: int = 0
     notes_used: List[int] = field(default_factory=list)
 
-@dataclass
+# Record layout of MIDITrack.note_array, one record per note
+NOTE_DTYPE = np.dtype([("channel", np.uint8), ("note_number", np.uint8), ("velocity", np.float64),
+                       ("time_on", np.float64), ("time_off", np.float64)])
+
+@dataclass(slots=True)
 class MIDITrack:
     """
     This class stores and manages MIDI notes within a track, providing functionality to evaluate
@@ -126,7 +157,10 @@ class MIDITrack:
         min_note (int): The lowest note number in the track (defaults to 1000).
         max_note (int): The highest note number in the track (defaults to 0).
         notes (List[MIDINote]): List of MIDI notes contained in the track.
-        notes_used (List[int]): List of note numbers that are used in the track.
+        notes_used (List[int]): Sorted list of note numbers that are used in the track.
+    note_array, a numpy structured array of NOTE_DTYPE mirroring the notes, and the
+    arrays used by evaluate_all are only built on first use of evaluate_all.
+    Notes must not be modified afterwards.
     """
     name: str = ""
     index: int = 0
@@ -136,6 +170,76 @@ class MIDITrack:
     max_velo: int = 0
     notes: List[MIDINote] = field(default_factory=list)
     notes_used: List[int] = field(default_factory=list)
+    _note_array: np.ndarray = field(default=None, init=False, repr=False, compare=False)
+    _channel_bounds: dict = field(default=None, init=False, repr=False, compare=False)
+    _num: np.ndarray = field(default=None, init=False, repr=False, compare=False)
+    _ton: np.ndarray = field(default=None, init=False, repr=False, compare=False)
+    _toff: np.ndarray = field(default=None, init=False, repr=False, compare=False)
+    _vel: np.ndarray = field(default=None, init=False, repr=False, compare=False)
+    _max_toff: np.ndarray = field(default=None, init=False, repr=False, compare=False)
+    _slice_of: dict = field(default=None, init=False, repr=False, compare=False)
+    _sorted_notes: List[MIDINote] = field(default=None, init=False, repr=False, compare=False)
+    _sorted_time_on: List[float] = field(default=None, init=False, repr=False, compare=False)
+    _max_time_off: List[float] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def note_array(self):
+        """
+        The notes as a numpy structured array of NOTE_DTYPE, in the order of notes.
+        Built on first use.
+        """
+        if self._note_array is None:
+            self._note_array = np.fromiter(
+                ((note.channel, note.note_number, note.velocity, note.time_on, note.time_off)
+                 for note in self.notes), dtype=NOTE_DTYPE, count=len(self.notes))
+        return self._note_array
+
+    def _build_arrays(self):
+        """
+        Build the numpy arrays (one per note attribute) used to select active notes.
+        Notes are sorted by (channel, time_on), each channel maps to its (start, end)
+        slice, and the running max of time_off inside the slice gives the first note
+        that can still be sounding at a given time.
+        """
+        note_array = self.note_array
+        count = len(note_array)
+        sorted_notes = note_array[np.lexsort((note_array["time_on"], note_array["channel"]))]
+        chan = sorted_notes["channel"]
+        self._num = np.ascontiguousarray(sorted_notes["note_number"])
+        self._ton = np.ascontiguousarray(sorted_notes["time_on"])
+        self._toff = np.ascontiguousarray(sorted_notes["time_off"])
+        self._vel = np.ascontiguousarray(sorted_notes["velocity"])
+
+        self._channel_bounds = {}
+        self._max_toff = np.empty(count)
+        channels, starts = np.unique(chan, return_index=True)
+        for channel, start, end in zip(channels.tolist(), starts.tolist(),
+                                       starts[1:].tolist() + [count]):
+            self._channel_bounds[channel] = (start, end)
+            self._max_toff[start:end] = np.maximum.accumulate(self._toff[start:end])
+
+    def _build_index(self):
+        """
+        Index notes by (channel, note_number) for evaluate.
+        Notes are sorted by (channel, note_number, time_on) in a separate list, track order
+        is kept. Each key maps to its (start, end) slice, and the running max of time_off
+        inside the slice allows to stop scanning backward once notes are all released.
+        """
+        self._sorted_notes = sorted(self.notes,
+                                    key=attrgetter("channel", "note_number", "time_on"))
+        self._sorted_time_on = [note.time_on for note in self._sorted_notes]
+        self._max_time_off = []
+        self._slice_of = {}
+        index = 0
+        for key, group in groupby(self._sorted_notes, key=attrgetter("channel", "note_number")):
+            start = index
+            max_time_off = float("-inf")
+            for note in group:
+                if note.time_off > max_time_off:
+                    max_time_off = note.time_off
+                self._max_time_off.append(max_time_off)
+                index += 1
+            self._slice_of[key] = (start, index)
 
     def evaluate(self, time, channel, note_number,
         attack_time, attack_interpolation, decay_time, decay_interpolation, sustain_level,
@@ -162,12 +266,33 @@ class MIDITrack:
             envelope for all matching notes that are active at the given time point. 
             Returns the maximum envelope value among all matching notes.
         """
-        note_filter = lambda note: note.channel == channel and note.note_number == note_number
-        time_filter = lambda note: note.time_off + release_time >= time >= note.time_on
-        filtered_notes = filter(lambda note: note_filter(note) and time_filter(note), self.notes)
-        arguments = (time, attack_time, attack_interpolation, decay_time, decay_interpolation,
-            sustain_level, release_time, release_interpolation, velocity_sensitivity)
-        return max((note.evaluate(*arguments) for note in filtered_notes), default=0.0)
+        if self._slice_of is None:
+            self._build_index()
+
+        bounds = self._slice_of.get((channel, note_number))
+        if bounds is None:
+            return 0.0
+
+        # Only notes started at time can be active, walk them backward from the latest
+        start, end = bounds
+        end = bisect_right(self._sorted_time_on, time, start, end)
+        notes = self._sorted_notes
+        max_time_off = self._max_time_off
+        evaluator = _compile_evaluator(attack_time, attack_interpolation, decay_time,
+            decay_interpolation, sustain_level, release_time, release_interpolation,
+            velocity_sensitivity)
+        best = None
+        for index in range(end - 1, start - 1, -1):
+            if max_time_off[index] + release_time < time:
+                break
+            note = notes[index]
+            time_off = note.time_off
+            if time_off + release_time < time:
+                continue
+            value = evaluator(time, note.time_on, time_off, note.velocity)
+            if best is None or value > best:
+                best = value
+        return 0.0 if best is None else best
 
     def evaluate_all(self, time, channel,
         attack_time, attack_interpolation, decay_time, decay_interpolation, sustain_level,
@@ -195,19 +320,33 @@ class MIDITrack:
             list[float]: A list of 128 envelope values (0-1), one for each MIDI note number,
                          where each value represents the current amplitude of that note
         """
-        channel_filter = lambda note: note.channel == channel
-        time_filter = lambda note: note.time_off + release_time >= time >= note.time_on
-        filtered_notes = list(filter(lambda note: channel_filter(note)
-                         and time_filter(note), self.notes))
-        arguments = (time, attack_time, attack_interpolation, decay_time, decay_interpolation,
-            sustain_level, release_time, release_interpolation, velocity_sensitivity)
-        note_values = []
-        for i in range(128):
-            filtered_by_number_notes = filter(lambda note: note.note_number == i, filtered_notes)
-            value = max((note.evaluate(*arguments) for note in filtered_by_number_notes),
-                    default=0.0)
-            note_values.append(value)
-        return note_values
+        if self._channel_bounds is None:
+            self._build_arrays()
+
+        bounds = self._channel_bounds.get(channel)
+        if bounds is None:
+            return [0.0] * 128
+
+        # Only the channel notes started at time and not all released before can be active,
+        # the window start is taken with a small margin and refined by the exact test
+        start, end = bounds
+        end = start + int(np.searchsorted(self._ton[start:end], time, side="right"))
+        start = start + int(np.searchsorted(self._max_toff[start:end],
+                                            time - release_time - 1e-6, side="left"))
+        active = start + np.flatnonzero(self._toff[start:end] + release_time >= time)
+
+        evaluator = _compile_evaluator(attack_time, attack_interpolation, decay_time,
+            decay_interpolation, sustain_level, release_time, release_interpolation,
+            velocity_sensitivity)
+        note_values = [None] * 128
+        for note_number, time_on, time_off, velocity in zip(self._num[active].tolist(),
+                self._ton[active].tolist(), self._toff[active].tolist(),
+                self._vel[active].tolist()):
+            value = evaluator(time, time_on, time_off, velocity)
+            current = note_values[note_number]
+            if current is None or value > current:
+                note_values[note_number] = value
+        return [0.0 if value is None else value for value in note_values]
 
     def copy(self):
         """
@@ -222,7 +361,7 @@ class MIDITrack:
                 [n.copy() for n in self.notes])
 
 # Channel events
-@dataclass
+@dataclass(slots=True)
 class NoteOnEvent:
     """
     This class encapsulates MIDI Note On events, which occur when a note starts playing.
@@ -244,18 +383,19 @@ class NoteOnEvent:
         Args:
             delta_time (int): The delta time of the MIDI event.
             channel (int): The MIDI channel number (0-15).
-            memory_map (mmap.mmap): Memory map object containing MIDI data.
+            memory_map (MidiCursor): Cursor over the MIDI data.
         Returns:
             MIDINote: A new MIDI note event instance.
         Note:
             This method expects the memory map's current position to be at the start of
             note and velocity bytes. It will advance the memory map position by 2 bytes.
         """
-        note = struct.unpack("B", memory_map.read(1))[0]
-        velocity = struct.unpack("B", memory_map.read(1))[0]
-        return cls(delta_time, channel, note, velocity)
+        pos = memory_map.pos
+        data = memory_map.data
+        memory_map.pos = pos + 2
+        return cls(delta_time, channel, data[pos], data[pos + 1])
 
-@dataclass
+@dataclass(slots=True)
 class NoteOffEvent:
     """
     This class encapsulates the properties and parsing logic for MIDI Note Off messages,
@@ -278,18 +418,19 @@ class NoteOffEvent:
         Args:
             delta_time (int): The delta time for this MIDI message
             channel (int): The MIDI channel number (0-15)
-            memory_map (mmap.mmap): Memory mapped file object to read from
+            memory_map (MidiCursor): Cursor over the MIDI data to read from
         Returns:
             MidiMessage: A new MIDI message instance constructed from the memory map data
         Reads 2 bytes from the memory map:
         - First byte: note number (0-127)
         - Second byte: velocity (0-127)
         """
-        note = struct.unpack("B", memory_map.read(1))[0]
-        velocity = struct.unpack("B", memory_map.read(1))[0]
-        return cls(delta_time, channel, note, velocity)
+        pos = memory_map.pos
+        data = memory_map.data
+        memory_map.pos = pos + 2
+        return cls(delta_time, channel, data[pos], data[pos + 1])
 
-@dataclass
+@dataclass(slots=True)
 class NotePressureEvent:
     delta_time: int
     channel: int
@@ -298,11 +439,12 @@ class NotePressureEvent:
 
     @classmethod
     def from_memory_map(cls, delta_time, channel, memory_map):
-        note = struct.unpack("B", memory_map.read(1))[0]
-        pressure = struct.unpack("B", memory_map.read(1))[0]
-        return cls(delta_time, channel, note, pressure)
+        pos = memory_map.pos
+        data = memory_map.data
+        memory_map.pos = pos + 2
+        return cls(delta_time, channel, data[pos], data[pos + 1])
 
-@dataclass
+@dataclass(slots=True)
 class ControllerEvent:
     delta_time: int
     channel: int
@@ -311,11 +453,12 @@ class ControllerEvent:
 
     @classmethod
     def from_memory_map(cls, delta_time, channel, memory_map):
-        controller = struct.unpack("B", memory_map.read(1))[0]
-        value = struct.unpack("B", memory_map.read(1))[0]
-        return cls(delta_time, channel, controller, value)
+        pos = memory_map.pos
+        data = memory_map.data
+        memory_map.pos = pos + 2
+        return cls(delta_time, channel, data[pos], data[pos + 1])
 
-@dataclass
+@dataclass(slots=True)
 class ProgramEvent:
     delta_time: int
     channel: int
@@ -323,10 +466,10 @@ class ProgramEvent:
 
     @classmethod
     def from_memory_map(cls, delta_time, channel, memory_map):
-        program = struct.unpack("B", memory_map.read(1))[0]
+        program = memory_map.read_byte()
         return cls(delta_time, channel, program)
 
-@dataclass
+@dataclass(slots=True)
 class ChannelPressureEvent:
     delta_time: int
     channel: int
@@ -334,10 +477,10 @@ class ChannelPressureEvent:
 
     @classmethod
     def from_memory_map(cls, delta_time, channel, memory_map):
-        pressure = struct.unpack("B", memory_map.read(1))[0]
+        pressure = memory_map.read_byte()
         return cls(delta_time, channel, pressure)
 
-@dataclass
+@dataclass(slots=True)
 class PitchBendEvent:
     delta_time: int
     channel: int
@@ -346,132 +489,133 @@ class PitchBendEvent:
 
     @classmethod
     def from_memory_map(cls, delta_time, channel, memory_map):
-        lsb = struct.unpack("B", memory_map.read(1))[0]
-        msb = struct.unpack("B", memory_map.read(1))[0]
-        return cls(delta_time, channel, lsb, msb)
+        pos = memory_map.pos
+        data = memory_map.data
+        memory_map.pos = pos + 2
+        return cls(delta_time, channel, data[pos], data[pos + 1])
 
 # Only track events
-@dataclass
+@dataclass(slots=True)
 class SequenceNumberEvent:
     delta_time: int
     sequence_number: int
 
     @classmethod
     def from_memory_map(cls, delta_time, length, memory_map):
-        sequence_number = struct.unpack(">H", memory_map.read(2))[0]
+        sequence_number = _U16BE(memory_map.read(2))[0]
         return cls(delta_time, sequence_number)
 
-@dataclass
+@dataclass(slots=True)
 class TextEvent:
     delta_time: int
     text: str
 
     @classmethod
     def from_memory_map(cls, delta_time, length, memory_map):
-        text = struct.unpack(f"{length}s", memory_map.read(length))[0].decode("latin-1")
+        text = _read_text(memory_map, length)
         return cls(delta_time, text)
 
-@dataclass
+@dataclass(slots=True)
 class CopyrightEvent:
     delta_time: int
     copyright: str
 
     @classmethod
     def from_memory_map(cls, delta_time, length, memory_map):
-        copyright = struct.unpack(f"{length}s", memory_map.read(length))[0].decode("latin-1")
+        copyright = _read_text(memory_map, length)
         return cls(delta_time, copyright)
 
-@dataclass
+@dataclass(slots=True)
 class TrackNameEvent:
     delta_time: int
     name: str
 
     @classmethod
     def from_memory_map(cls, delta_time, length, memory_map):
-        name = struct.unpack(f"{length}s", memory_map.read(length))[0].decode("latin-1")
+        name = _read_name(memory_map, length)
         return cls(delta_time, name)
 
-@dataclass
+@dataclass(slots=True)
 class InstrumentNameEvent:
     delta_time: int
     name: str
 
     @classmethod
     def from_memory_map(cls, delta_time, length, memory_map):
-        name = struct.unpack(f"{length}s", memory_map.read(length))[0].decode("latin-1")
+        name = _read_name(memory_map, length)
         return cls(delta_time, name)
 
-@dataclass
+@dataclass(slots=True)
 class LyricEvent:
     delta_time: int
     lyric: str
 
     @classmethod
     def from_memory_map(cls, delta_time, length, memory_map):
-        lyric = struct.unpack(f"{length}s", memory_map.read(length))[0].decode("latin-1")
+        lyric = _read_text(memory_map, length)
         return cls(delta_time, lyric)
 
-@dataclass
+@dataclass(slots=True)
 class MarkerEvent:
     delta_time: int
     marker: str
 
     @classmethod
     def from_memory_map(cls, delta_time, length, memory_map):
-        marker = struct.unpack(f"{length}s", memory_map.read(length))[0].decode("latin-1")
+        marker = _read_text(memory_map, length)
         return cls(delta_time, marker)
 
-@dataclass
+@dataclass(slots=True)
 class CuePointEvent:
     delta_time: int
     cue_point: str
 
     @classmethod
     def from_memory_map(cls, delta_time, length, memory_map):
-        cue_point = struct.unpack(f"{length}s", memory_map.read(length))[0].decode("latin-1")
+        cue_point = _read_text(memory_map, length)
         return cls(delta_time, cue_point)
 
-@dataclass
+@dataclass(slots=True)
 class ProgramNameEvent:
     delta_time: int
     name: str
 
     @classmethod
     def from_memory_map(cls, delta_time, length, memory_map):
-        name = struct.unpack(f"{length}s", memory_map.read(length))[0].decode("latin-1")
+        name = _read_name(memory_map, length)
         return cls(delta_time, name)
 
-@dataclass
+@dataclass(slots=True)
 class DeviceNameEvent:
     delta_time: int
     name: str
 
     @classmethod
     def from_memory_map(cls, delta_time, length, memory_map):
-        name = struct.unpack(f"{length}s", memory_map.read(length))[0].decode("latin-1")
+        name = _read_name(memory_map, length)
         return cls(delta_time, name)
 
-@dataclass
+@dataclass(slots=True)
 class MidiChannelPrefixEvent:
     delta_time: int
     prefix: int
 
     @classmethod
     def from_memory_map(cls, delta_time, length, memory_map):
-        prefix = struct.unpack("B", memory_map.read(1))[0]
+        prefix = memory_map.read_byte()
         return cls(delta_time, prefix)
 
-@dataclass
+@dataclass(slots=True)
 class MidiPortEvent:
     delta_time: int
     port: int
 
     @classmethod
     def from_memory_map(cls, delta_time, length, memory_map):
-        port = struct.unpack("B", memory_map.read(1))[0]
+        port = memory_map.read_byte()
         return cls(delta_time, port)
 
-@dataclass
+@dataclass(slots=True)
 class EndOfTrackEvent:
     delta_time: int
 
@@ -479,17 +623,18 @@ class EndOfTrackEvent:
     def from_memory_map(cls, delta_time, length, memory_map):
         return cls(delta_time)
 
-@dataclass
+@dataclass(slots=True)
 class TempoEvent:
     delta_time: int
     tempo: int
 
     @classmethod
     def from_memory_map(cls, delta_time, length, memory_map):
-        tempo = struct.unpack(">I", b"\x00" + memory_map.read(3))[0]
+        data = memory_map.read(3)
+        tempo = (data[0] << 16) | (data[1] << 8) | data[2]
         return cls(delta_time, tempo)
 
-@dataclass
+@dataclass(slots=True)
 class SmpteOffsetEvent:
     delta_time: int
     hours: int
@@ -500,14 +645,10 @@ class SmpteOffsetEvent:
 
     @classmethod
     def from_memory_map(cls, delta_time, length, memory_map):
-        hours = struct.unpack("B", memory_map.read(1))[0]
-        minutes = struct.unpack("B", memory_map.read(1))[0]
-        seconds = struct.unpack("B", memory_map.read(1))[0]
-        fps = struct.unpack("B", memory_map.read(1))[0]
-        fractional_frames = struct.unpack("B", memory_map.read(1))[0]
-        return cls(delta_time, hours, minutes, seconds, fps, fractional_frames)
-
-@dataclass
+        data = memory_map.read(5)
+        return cls(delta_time, data[0], data[1], data[2], data[3], data[4])
+
+@dataclass(slots=True)
 class TimeSignatureEvent:
     delta_time: int
     numerator: int
@@ -517,14 +658,10 @@ class TimeSignatureEvent:
 
     @classmethod
     def from_memory_map(cls, delta_time, length, memory_map):
-        numerator = struct.unpack("B", memory_map.read(1))[0]
-        denominator = struct.unpack("B", memory_map.read(1))[0]
-        clocks_per_click = struct.unpack("B", memory_map.read(1))[0]
-        thirty_second_per_24_clocks = struct.unpack("B", memory_map.read(1))[0]
-        return cls(delta_time, numerator, denominator, clocks_per_click,
-                   thirty_second_per_24_clocks)
-
-@dataclass
+        data = memory_map.read(4)
+        return cls(delta_time, data[0], data[1], data[2], data[3])
+
+@dataclass(slots=True)
 class KeySignatureEvent:
     delta_time: int
     flats_sharps: int
@@ -532,38 +669,38 @@ class KeySignatureEvent:
 
     @classmethod
     def from_memory_map(cls, delta_time, length, memory_map):
-        flats_sharps = struct.unpack("B", memory_map.read(1))[0]
-        major_minor = struct.unpack("B", memory_map.read(1))[0]
+        data = memory_map.read(2)
+        flats_sharps, major_minor = data[0], data[1]
         return cls(delta_time, flats_sharps, major_minor)
 
-@dataclass
+@dataclass(slots=True)
 class SequencerEvent:
     delta_time: int
     data: bytes
 
     @classmethod
     def from_memory_map(cls, delta_time, length, memory_map):
-        data = struct.unpack(f"{length}s", memory_map.read(length))[0]
+        data = memory_map.read(length)
         return cls(delta_time, data)
 
-@dataclass
+@dataclass(slots=True)
 class SysExEvent:
     delta_time: int
     data: bytes
 
     @classmethod
     def from_memory_map(cls, delta_time, length, memory_map):
-        data = struct.unpack(f"{length}s", memory_map.read(length))[0]
+        data = memory_map.read(length)
         return cls(delta_time, data)
 
-@dataclass
+@dataclass(slots=True)
 class EscapeSequenceEvent:
     delta_time: int
     data: bytes
 
     @classmethod
     def from_memory_map(cls, delta_time, length, memory_map):
-        data = struct.unpack(f"{length}s", memory_map.read(length))[0]
+        data = memory_map.read(length)
         return cls(delta_time, data)
 
 # A brief description of the MIDI specification:
@@ -606,24 +743,61 @@ channel_event_by_status = {
     0xE0 : PitchBendEvent,
 }
 
+# Channel event classes indexed by the high nibble of the status byte minus 8
+_CHANNEL_EVENT_CLASSES = [channel_event_by_status.get(nibble << 4) for nibble in range(0x8, 0x10)]
+
+class MidiCursor:
+    """
+    In-memory replacement of the mmap the parser used to read from.
+    The whole file is read once into bytes and an explicit position is kept.
+    It offers the part of the mmap interface used by the events (read, read_byte, seek),
+    the hot paths (unpack_vlq, parse_event) index data directly.
+    """
+    __slots__ = ("data", "pos")
+
+    def __init__(self, data, pos=0):
+        self.data = data
+        self.pos = pos
+
+    def read(self, length):
+        pos = self.pos
+        self.pos = pos + length
+        return self.data[pos:pos + length]
+
+    def read_byte(self):
+        pos = self.pos
+        self.pos = pos + 1
+        return self.data[pos]
+
+    def seek(self, offset, whence=SEEK_SET):
+        if whence == SEEK_CUR:
+            self.pos += offset
+        else:
+            self.pos = offset
+
 def unpack_vlq(memory_map):
-    total = 0
-    while True:
-        char = struct.unpack("B", memory_map.read(1))[0]
-        total = (total << 7) + (char & 0x7F)
-        if not char & 0x80: break
+    # Most delta times fit in a single byte, so the loop is usually skipped.
+    data = memory_map.data
+    pos = memory_map.pos
+    char = data[pos]
+    total = char & 0x7F
+    while char & 0x80:
+        pos += 1
+        char = data[pos]
+        total = (total << 7) | (char & 0x7F)
+    memory_map.pos = pos + 1
     return total
 
 def parse_channel_event(delta_time, status, memory_map):
     channel = status & 0xF
-    event_class = channel_event_by_status[status & 0xF0]
+    event_class = _CHANNEL_EVENT_CLASSES[(status >> 4) - 8]
     event = event_class.from_memory_map(delta_time, channel, memory_map)
-    if isinstance(event, NoteOnEvent) and event.velocity == 0:
+    if event_class is NoteOnEvent and event.velocity == 0:
         return NoteOffEvent(delta_time, channel, event.note, 0)
     return event
 
 def parse_meta_event(delta_time, memory_map):
-    event_type = struct.unpack("B", memory_map.read(1))[0]
+    event_type = memory_map.read_byte()
     length = unpack_vlq(memory_map)
     event_class = meta_event_by_type[event_type]
     event = event_class.from_memory_map(delta_time, length, memory_map)
@@ -631,45 +805,132 @@ def parse_meta_event(delta_time, memory_map):
 
 def parse_sys_ex_event(delta_time, status, memory_map):
     length = unpack_vlq(memory_map)
-    if status == 0xF0:
-        return SysExEvent.from_memory_map(delta_time, length, memory_map)
-    elif status == 0xF7:
-        return EscapeSequenceEvent.from_memory_map(delta_time, length, memory_map)
+    event_class = SysExEvent if status == 0xF0 else EscapeSequenceEvent
+    return event_class.from_memory_map(delta_time, length, memory_map)
 
-def parse_event(memory_map, parse_state):
-    delta_time = unpack_vlq(memory_map)
-    status = struct.unpack("B", memory_map.read(1))[0]
-
-    if status & 0x80: parse_state.runningStatus = status
-    else: memory_map.seek(-1, SEEK_CUR)
+def _parse_meta_status_event(delta_time, status, memory_map):
+    return parse_meta_event(delta_time, memory_map)
 
-    running_status = parse_state.runningStatus
-    if running_status == 0xFF:
-        return parse_meta_event(delta_time, memory_map)
-    elif running_status == 0xF0 or running_status == 0xF7:
-        return parse_sys_ex_event(delta_time, running_status, memory_map)
-    elif running_status >= 0x80:
-        return parse_channel_event(delta_time, running_status, memory_map)
+# Event parser for each status byte, None for data bytes and undefined system messages
+_PARSE_DISPATCH = [None] * 256
+for _status in range(0x80, 0xF0):
+    _PARSE_DISPATCH[_status] = parse_channel_event
+_PARSE_DISPATCH[0xF0] = parse_sys_ex_event
+_PARSE_DISPATCH[0xF7] = parse_sys_ex_event
+_PARSE_DISPATCH[0xFF] = _parse_meta_status_event
+del _status
 
-@dataclass
+def parse_event(memory_map, parse_state):
+    delta_time = unpack_vlq(memory_map)
+    # A data byte (running status) is left in place for the event to read
+    status = memory_map.data[memory_map.pos]
+    if status & 0x80:
+        parse_state.running_status = status
+        memory_map.pos += 1
+
+    running_status = parse_state.running_status
+    handler = _PARSE_DISPATCH[running_status]
+    if handler is not None:
+        return handler(delta_time, running_status, memory_map)
+    return None
+
+@dataclass(slots=True)
 class MidiParseState:
     running_status: int = 0
 
 def parse_events(memory_map):
+    """
+    Parse the events of a track up to its EndOfTrackEvent.
+    Undefined status bytes yield no event and are left out.
+    """
     events = []
     parse_state = MidiParseState()
+    # Module level names used for every event, bound to locals once
+    parse = parse_event
+    append = events.append
+    end_of_track_event = EndOfTrackEvent
     while True:
-        event = parse_event(memory_map, parse_state)
-        events.append(event)
-        if isinstance(event, EndOfTrackEvent): break
+        event = parse(memory_map, parse_state)
+        if event is None: continue
+        append(event)
+        if type(event) is end_of_track_event: break
     return events
 
+def stream_events(memory_map, visitor):
+    """
+    Decode the events of a track up to its end and report the ones read_midi_file
+    uses to visitor, without building event objects:
+    note_on(ticks, channel, note, velocity), note_off(ticks, channel, note),
+    tempo(ticks, tempo), track_name(name) and end_of_track(ticks).
+    Note On events with zero velocity are reported as note_off.
+    The whole state machine runs on local variables, variable length quantities
+    are decoded inline and the position is written back to memory_map at the end.
+    """
+    data = memory_map.data
+    pos = memory_map.pos
+    note_on = visitor.note_on
+    note_off = visitor.note_off
+    time_in_ticks = 0
+    running_status = 0
+    while True:
+        char = data[pos]
+        pos += 1
+        delta_time = char & 0x7F
+        while char & 0x80:
+            char = data[pos]
+            pos += 1
+            delta_time = (delta_time << 7) | (char & 0x7F)
+        time_in_ticks += delta_time
+
+        status = data[pos]
+        if status & 0x80:
+            running_status = status
+            pos += 1
+        kind = running_status & 0xF0
+        if kind == 0x90 or kind == 0x80:
+            note = data[pos]
+            velocity = data[pos + 1]
+            pos += 2
+            if kind == 0x90 and velocity:
+                note_on(time_in_ticks, running_status & 0xF, note, velocity)
+            else:
+                note_off(time_in_ticks, running_status & 0xF, note)
+        elif kind == 0xC0 or kind == 0xD0:
+            pos += 1
+        elif running_status == 0xFF or running_status == 0xF0 or running_status == 0xF7:
+            if running_status == 0xFF:
+                event_type = data[pos]
+                pos += 1
+            char = data[pos]
+            pos += 1
+            length = char & 0x7F
+            while char & 0x80:
+                char = data[pos]
+                pos += 1
+                length = (length << 7) | (char & 0x7F)
+            start = pos
+            pos += length
+            if running_status != 0xFF:
+                continue
+            if event_type == 0x51:
+                visitor.tempo(time_in_ticks,
+                              (data[start] << 16) | (data[start + 1] << 8) | data[start + 2])
+            elif event_type == 0x03:
+                visitor.track_name(sys.intern(data[start:pos].decode("latin-1")))
+            elif event_type == 0x2F:
+                visitor.end_of_track(time_in_ticks)
+                break
+        elif running_status >= 0x80 and kind != 0xF0:
+            # Note pressure, controller and pitch bend events
+            pos += 2
+    memory_map.pos = pos
+
 def parse_track_header(memory_map):
     identifier = memory_map.read(4).decode('latin-1')
-    chunk_length = struct.unpack(">I", memory_map.read(4))[0]
+    chunk_length = _U32BE(memory_map.read(4))[0]
     return chunk_length
 
-@dataclass
+@dataclass(slots=True)
 class MidiTrack:
     events: List
 
@@ -679,18 +940,40 @@ class MidiTrack:
         events = parse_events(memory_map)
         return cls(events)
 
+    @classmethod
+    def from_chunk(cls, data, start):
+        """Parse the events of the track chunk whose body starts at start in data."""
+        return cls(parse_events(MidiCursor(data, start)))
+
 def parse_header(memory_map):
     identifier = memory_map.read(4).decode('latin-1')
-    chunk_length = struct.unpack(">I", memory_map.read(4))[0]
-    midi_format = struct.unpack(">H", memory_map.read(2))[0]
-    tracks_count = struct.unpack(">H", memory_map.read(2))[0]
-    ppqn = struct.unpack(">H", memory_map.read(2))[0]
+    chunk_length = _U32BE(memory_map.read(4))[0]
+    midi_format = _U16BE(memory_map.read(2))[0]
+    tracks_count = _U16BE(memory_map.read(2))[0]
+    ppqn = _U16BE(memory_map.read(2))[0]
     return midi_format, tracks_count, ppqn
 
+def scan_track_chunks(memory_map, tracks_count):
+    """
+    Find the body start of each track chunk from the chunk headers only.
+    Chunks other than MTrk are skipped, as required by the MIDI file specification.
+    """
+    data = memory_map.data
+    pos = memory_map.pos
+    starts = []
+    while len(starts) < tracks_count and pos + 8 <= len(data):
+        chunk_length = _U32BE(data[pos + 4:pos + 8])[0]
+        if data[pos:pos + 4] == b"MTrk":
+            starts.append(pos + 8)
+        pos += 8 + chunk_length
+    return starts
+
 def parse_tracks(memory_map, tracks_count):
-    return [MidiTrack.from_memory_map(memory_map) for i in range(tracks_count)]
+    # Each track is parsed from its own chunk boundaries, independently of the others
+    starts = scan_track_chunks(memory_map, tracks_count)
+    return [MidiTrack.from_chunk(memory_map.data, start) for start in starts]
 
-@dataclass
+@dataclass(slots=True)
 class MIDIFile:
     midi_format: int
     ppqn: int
@@ -700,14 +983,13 @@ class MIDIFile:
     @classmethod
     def from_file(cls, file_path):
         with open(file_path, "rb") as f:
-            memory_map = mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ)
-            midi_format, tracks_count, ppqn = parse_header(memory_map)
-            tracks = parse_tracks(memory_map, tracks_count)
-            memory_map.close()
-            tempo = -1 # initialisation
-            return cls(midi_format, ppqn, tempo, tracks)
-
-@dataclass
+            memory_map = MidiCursor(f.read())
+        midi_format, tracks_count, ppqn = parse_header(memory_map)
+        tracks = parse_tracks(memory_map, tracks_count)
+        tempo = -1 # initialisation
+        return cls(midi_format, ppqn, tempo, tracks)
+
+@dataclass(slots=True)
 class TempoEventRecord:
     time_in_ticks: int
     time_in_seconds: int
@@ -723,26 +1005,67 @@ class TempoMap:
         tracks = midi_file.tracks
         if midi_file.midi_format == 1: tracks = tracks[0:1]
         self.tempo_tracks = [[] * len(tracks)]
+        # Lookup tables per tempo track: tick, seconds and seconds per tick at each tempo change
+        self._tempo_ticks = [[] for _ in self.tempo_tracks]
+        self._tempo_seconds = [[] for _ in self.tempo_tracks]
+        self._seconds_per_tick = [[] for _ in self.tempo_tracks]
         for track_index, track in enumerate(tracks):
-            time_in_ticks = 0
-            time_in_seconds = 0
             tempo_events = self.tempo_tracks[track_index]
+            time_in_ticks = 0
+            tempo_ticks = []
+            tempos = []
             for event in track.events:
                 time_in_ticks += event.delta_time
-                time_in_seconds = self.time_in_ticks_to_seconds(track_index, time_in_ticks)
-                if not isinstance(event, TempoEvent): continue
-                tempo_events.append(TempoEventRecord(time_in_ticks, time_in_seconds, event.tempo))
+                if type(event) is TempoEvent:
+                    tempo_ticks.append(time_in_ticks)
+                    tempos.append(event.tempo)
+            if not tempo_ticks: continue
+            # Seconds are only needed at tempo changes: each one adds the ticks elapsed
+            # since the previous change at the previous tempo (default tempo before the first)
+            ticks = np.array(tempo_ticks, dtype=np.int64)
+            seconds_per_tick = np.array(tempos, dtype=np.float64) / self.ppqn / 1_000_000
+            elapsed_seconds = np.empty(len(ticks))
+            elapsed_seconds[0] = ticks[0] * (500_000 / self.ppqn / 1_000_000)
+            elapsed_seconds[1:] = np.diff(ticks) * seconds_per_tick[:-1]
+            tempo_seconds = np.cumsum(elapsed_seconds).tolist()
+            for time_in_ticks, time_in_seconds, tempo in zip(tempo_ticks, tempo_seconds, tempos):
+                tempo_events.append(TempoEventRecord(time_in_ticks, time_in_seconds, tempo))
+            self._tempo_ticks[track_index] = tempo_ticks
+            self._tempo_seconds[track_index] = tempo_seconds
+            self._seconds_per_tick[track_index] = seconds_per_tick.tolist()
+
+    def record_tempo(self, track_index, time_in_ticks, tempo):
+        """Append a tempo change, tempo changes must be recorded in time order."""
+        time_in_seconds = self.time_in_ticks_to_seconds(track_index, time_in_ticks)
+        self.tempo_tracks[track_index].append(TempoEventRecord(time_in_ticks, time_in_seconds, tempo))
+        self._tempo_ticks[track_index].append(time_in_ticks)
+        self._tempo_seconds[track_index].append(time_in_seconds)
+        self._seconds_per_tick[track_index].append(tempo / self.ppqn / 1_000_000)
+
+    def times_in_ticks_to_seconds(self, track_index, times_in_ticks):
+        """Same as time_in_ticks_to_seconds for a numpy array of ticks."""
+        track_index = track_index if self.midi_format != 1 else 0
+        default_seconds = times_in_ticks * (500_000 / self.ppqn / 1_000_000)
+        tempo_ticks = self._tempo_ticks[track_index]
+        if not tempo_ticks:
+            return default_seconds
+        segments = np.searchsorted(tempo_ticks, times_in_ticks, side="right") - 1
+        known = np.maximum(segments, 0)
+        elapsed_seconds = ((times_in_ticks - np.array(tempo_ticks, dtype=np.int64)[known])
+                           * np.array(self._seconds_per_tick[track_index])[known])
+        seconds = np.array(self._tempo_seconds[track_index])[known] + elapsed_seconds
+        return np.where(segments < 0, default_seconds, seconds)
 
     def time_in_ticks_to_seconds(self, track_index, time_in_ticks):
         track_index = track_index if self.midi_format != 1 else 0
-        tempo_events = self.tempo_tracks[track_index]
-        match_function = lambda event: event.time_in_ticks <= time_in_ticks
-        matched_events = filter(match_function, reversed(tempo_events))
-        tempo_event = next(matched_events, TempoEventRecord(0, 0, 500_000))
-        microseconds_per_tick = tempo_event.tempo / self.ppqn
-        seconds_per_tick = microseconds_per_tick / 1_000_000
-        elapsed_seconds = (time_in_ticks - tempo_event.time_in_ticks) * seconds_per_tick
-        return tempo_event.time_in_seconds + elapsed_seconds
+        tempo_ticks = self._tempo_ticks[track_index]
+        # Last tempo change at or before time_in_ticks, default tempo is 500 000 before any
+        segment = bisect_right(tempo_ticks, time_in_ticks) - 1
+        if segment < 0:
+            return time_in_ticks * (500_000 / self.ppqn / 1_000_000)
+        elapsed_seconds = ((time_in_ticks - tempo_ticks[segment])
+                           * self._seconds_per_tick[track_index][segment])
+        return self._tempo_seconds[track_index][segment] + elapsed_seconds
 
 # Notes:
 # - It is possible for multiple consecutive Note On Events to happen on the same
@@ -752,44 +1075,131 @@ class TempoMap:
 # - The MIDI parser takes care of running-status Note On Events with zero velocity
 #   so the code needn't check for that.
 
-@dataclass
+@dataclass(slots=True)
 class NoteOnRecord:
     ticks: int
-    time: float
     velocity: float
     number_of_notes: int = 1
 
 class TrackState:
     def __init__(self):
-        self.time_in_ticks = 0
-        self.time_in_seconds = 0
-        self.note_on_table = dict()
-
-    def update_time(self, track_index, tempo_map, delta_time):
-        self.time_in_ticks += delta_time
-        self.time_in_seconds = tempo_map.time_in_ticks_to_seconds(track_index, self.time_in_ticks)
-
-    def record_note_on(self, event):
-        key = (event.channel, event.note)
-        if key in self.note_on_table:
-            self.note_on_table[key].number_of_notes += 1
+        # One slot per (channel, note) pair, indexed by (channel << 7) | note
+        self.note_on_table = [None] * 2048
+
+    def record_note_on(self, channel, note, time_in_ticks, velocity):
+        key = (channel << 7) | note
+        note_on_record = self.note_on_table[key]
+        if note_on_record is not None:
+            note_on_record.number_of_notes += 1
         else:
-            self.note_on_table[key] = NoteOnRecord(self.time_in_ticks, self.time_in_seconds,
-                                                   event.velocity / 127)
+            self.note_on_table[key] = NoteOnRecord(time_in_ticks, velocity / 127)
 
-    def get_corresponding_note_on_record(self, event):
-        key = (event.channel, event.note)
+    def get_corresponding_note_on_record(self, channel, note):
+        key = (channel << 7) | note
         note_on_record = self.note_on_table[key]
+        if note_on_record is None:
+            # Note Off without a pending Note On
+            return None
         if note_on_record.number_of_notes == 1:
-            del self.note_on_table[key]
+            self.note_on_table[key] = None
             return note_on_record
         else:
             note_on_record.number_of_notes -= 1
             return None
 
+class TrackVisitor:
+    """
+    Receive the events of one track from stream_events and build its notes.
+    Tempo changes are added to tempo_map when tempo_track_index is set.
+    Note numbers and velocities are only flagged while streaming, and paired notes
+    are kept in ticks. Once the end of the track is reached, notes_used and the ranges
+    are reduced from the flags and the note times converted to seconds in one pass.
+    """
+    def __init__(self, track_index, tempo_map, tempo_track_index=None):
+        self.track_index = track_index
+        self.tempo_map = tempo_map
+        self.tempo_track_index = tempo_track_index
+        self.track_state = TrackState()
+        # Bound once, these are called for every note event
+        self.record_note_on = self.track_state.record_note_on
+        self.get_note_on_record = self.track_state.get_corresponding_note_on_record
+        self.paired_notes = []
+        self.notes = []
+        self.note_array = None
+        self.note_flags = bytearray(256)
+        self.velocity_flags = bytearray(256)
+        self.notes_used = []
+        self.name = ""
+        self.min_note = 1000
+        self.max_note = 0
+        self.min_velo = 127
+        self.max_velo = 0
+        self.min_duration_in_ticks = 1000000
+
+    def note_on(self, time_in_ticks, channel, note, velocity):
+        self.record_note_on(channel, note, time_in_ticks, velocity)
+        self.note_flags[note] = 1
+        self.velocity_flags[velocity] = 1
+
+    def note_off(self, time_in_ticks, channel, note):
+        note_on_record = self.get_note_on_record(channel, note)
+        if note_on_record is None: return
+        self.paired_notes.append((channel, note, note_on_record.ticks, time_in_ticks,
+                                  note_on_record.velocity))
+
+    def tempo(self, time_in_ticks, tempo):
+        if self.tempo_track_index is not None:
+            self.tempo_map.record_tempo(self.tempo_track_index, time_in_ticks, tempo)
+
+    def track_name(self, name):
+        self.name = name
+
+    def end_of_track(self, time_in_ticks):
+        # Every tempo change this track depends on is known by now
+        if self.paired_notes:
+            channels, note_numbers, ticks_on, ticks_off, velocities = zip(*self.paired_notes)
+            ticks_on = np.array(ticks_on, dtype=np.int64)
+            ticks_off = np.array(ticks_off, dtype=np.int64)
+            note_array = np.empty(len(ticks_on), dtype=NOTE_DTYPE)
+            note_array["channel"] = channels
+            note_array["note_number"] = note_numbers
+            note_array["velocity"] = velocities
+            note_array["time_on"] = self.tempo_map.times_in_ticks_to_seconds(self.track_index,
+                                                                             ticks_on)
+            note_array["time_off"] = self.tempo_map.times_in_ticks_to_seconds(self.track_index,
+                                                                              ticks_off)
+            self.note_array = note_array
+            self.notes = list(map(MIDINote, channels, note_numbers,
+                                  note_array["time_on"].tolist(),
+                                  note_array["time_off"].tolist(), velocities))
+            self.min_duration_in_ticks = int((ticks_off - ticks_on).min())
+            self.paired_notes = []
+        self.notes_used = np.flatnonzero(np.frombuffer(self.note_flags, dtype=np.uint8)).tolist()
+        if self.notes_used:
+            velocities_used = np.flatnonzero(np.frombuffer(self.velocity_flags, dtype=np.uint8))
+            self.min_note = self.notes_used[0]
+            self.max_note = self.notes_used[-1]
+            self.min_velo = int(velocities_used[0])
+            self.max_velo = int(velocities_used[-1])
+
 def read_midi_file(path):
-    midi_file = MIDIFile.from_file(path)
+    with open(path, "rb") as f:
+        memory_map = MidiCursor(f.read())
+    midi_format, tracks_count, ppqn = parse_header(memory_map)
+    starts = scan_track_chunks(memory_map, tracks_count)
+    # Tracks are streamed straight into the tempo map and the notes, no event list is kept
+    midi_file = MIDIFile(midi_format, ppqn, -1, [])
     tempo_map = TempoMap(midi_file)
+    if midi_format == 1:
+        # The first track only holds the tempo changes of the whole file
+        stream_events(MidiCursor(memory_map.data, starts[0]), TrackVisitor(0, tempo_map, 0))
+        starts = starts[1:]
+    visitors = []
+    for track_index, start in enumerate(starts):
+        tempo_track_index = track_index if midi_format != 1 else None
+        visitor = TrackVisitor(track_index, tempo_map, tempo_track_index)
+        stream_events(MidiCursor(memory_map.data, start), visitor)
+        visitors.append(visitor)
     # set tempo to tempo value if fixe for all midi_file
     if len(tempo_map.tempo_tracks) == 1:
         tempo = tempo_map.tempo_tracks[0][0].tempo
@@ -797,66 +1207,41 @@ def read_midi_file(path):
         tempo = 0
     midi_file.tempo = tempo
     working_tracks = []
-    file_tracks = midi_file.tracks if midi_file.midi_format != 1 else midi_file.tracks[1:]
+    # Note arrays of the working tracks, only kept while reading for the format 0 split
+    working_arrays = []
     track_index_used = 0
-    for track_index, track in enumerate(file_tracks):
-        notes = []
-        notes_used = []
-        track_name = ""
-        track_state = TrackState()
-        min_note = 1000
-        max_note = 0
-        min_velo = 127
-        max_velo = 0
-        min_duration_in_ticks = 1000000
-        for event in track.events:
-            track_state.update_time(track_index, tempo_map, event.delta_time)
-            if isinstance(event, TrackNameEvent):
-                track_name = event.name
-            elif isinstance(event, NoteOnEvent):
-                track_state.record_note_on(event)
-                min_note = min(min_note, event.note)
-                max_note = max(max_note, event.note)
-                min_velo = min(min_velo, event.velocity)
-                max_velo = max(max_velo, event.velocity)
-                if event.note not in notes_used:
-                    notes_used.append(event.note)
-            elif isinstance(event, NoteOffEvent):
-                note_on_record = track_state.get_corresponding_note_on_record(event)
-                if note_on_record is None: continue
-                start_time = note_on_record.time
-                velocity = note_on_record.velocity
-                end_time = track_state.time_in_seconds
-                notes.append(MIDINote(event.channel, event.note, start_time, end_time, velocity))
-                min_duration_in_ticks = min(min_duration_in_ticks,
-                                            track_state.time_in_ticks - note_on_record.ticks)
-        if bool(notes_used):
-            working_tracks.append(MIDITrack(track_name, track_index_used, min_note,
-                                  max_note, min_velo, max_velo, notes, notes_used))
+    for visitor in visitors:
+        if bool(visitor.notes_used):
+            working_tracks.append(MIDITrack(visitor.name, track_index_used, visitor.min_note,
+                                            visitor.max_note, visitor.min_velo, visitor.max_velo,
+                                            visitor.notes, visitor.notes_used))
+            working_arrays.append(visitor.note_array)
             track_index_used += 1
     if midi_file.midi_format == 0:
+        # Split the single track by channel
         track_index_used = 0
         tracks = []
-        for channel in range(16):
-            notes = []
-            notes_used = []
-            min_note = 1000
-            max_note = 0
-            min_velo = 127
-            max_velo = 0
-            for note in working_tracks[0].notes:
-                if note.channel == channel:
-                    notes.append(note)
-                    min_note = min(min_note, note.note_number)
-                    max_note = max(max_note, note.note_number)
-                    min_velo = min(min_velo, note.velocity)
-                    max_velo = max(max_velo, note.velocity)
-                    if note.note_number not in notes_used:
-                        notes_used.append(note.note_number)
-            if bool(notes_used):
-                tracks.append(MIDITrack(f"{working_tracks[0].name}-ch{channel}", track_index_used,
-                                        min_note, max_note, min_velo, max_velo, notes, notes_used))
-                track_index_used += 1
+        source_notes = working_tracks[0].notes if working_tracks else []
+        source_array = working_arrays[0] if working_tracks else None
+        if source_array is None:
+            source_array = np.empty(0, dtype=NOTE_DTYPE)
+        # One stable sort buckets the notes by channel, track order is kept in each bucket
+        order = np.argsort(source_array["channel"], kind="stable")
+        channels, starts = np.unique(source_array["channel"][order], return_index=True)
+        ends = starts[1:].tolist() + [len(order)]
+        for channel, start, end in zip(channels.tolist(), starts.tolist(), ends):
+            indices = order[start:end]
+            notes = [source_notes[index] for index in indices.tolist()]
+            note_array = source_array[indices]
+            numbers = note_array["note_number"]
+            velocities = note_array["velocity"]
+            notes_used = np.unique(numbers).tolist()
+            track = MIDITrack(f"{working_tracks[0].name}-ch{channel}", track_index_used,
+                              int(numbers.min()), int(numbers.max()),
+                              float(velocities.min()), float(velocities.max()),
+                              notes, notes_used)
+            tracks.append(track)
+            track_index_used += 1
     else:
         tracks = working_tracks
 
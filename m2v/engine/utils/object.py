@@ -301,8 +301,8 @@ def create_duplicate_linked_object(collection, original_object, name, independan
         linked_object.name = name
 
     collection.objects.link(linked_object)
-    if glb.master_loc_collection and collection.name+"_MasterLocation" in glb.master_loc_collection.objects:
-        parent_empty = glb.master_loc_collection.objects[collection.name+"_MasterLocation"]
+    parent_empty = glb.master_loc_empties.get(collection.name)
+    if parent_empty is not None:
         linked_object.parent = parent_empty
     return linked_object
 
@@ -343,11 +343,10 @@ def create_mat_global_custom():
         object.data.materials.append(material)
     """
     material_name = "GlobalCustomMaterial"
-    if material_name not in bpy.data.materials:
+    mat = bpy.data.materials.get(material_name)
+    if mat is None:
         mat = bpy.data.materials.new(name=material_name)
         mat.use_nodes = True
-    else:
-        mat = bpy.data.materials[material_name]
 
     # Configure the material nodes
     nodes = mat.node_tree.nodes
@@ -2,13 +2,13 @@
 Module for miscellaneous utility functions.
 """
 from os import path
-import re
+import numpy as np
 import bpy # type: ignore  # pylint: disable=import-error
 from ..globals import glb
 
 def init_log(log_file):
-    """Open log file for append"""
-    glb.f_log = open(log_file, "w+", encoding="utf-8")
+    """Open log file for append, writes are buffered until end_log"""
+    glb.f_log = open(log_file, "w+", encoding="utf-8", buffering=1 << 16)
 
 def w_log(to_log):
     """Write to screen and log"""
@@ -16,8 +16,12 @@ def w_log(to_log):
     glb.f_log.write(to_log + "\n")
 
 def end_log():
-    """Close logFile"""
+    """Flush and close logFile, if it is open"""
+    if glb.f_log is None:
+        return
+    glb.f_log.flush()
     glb.f_log.close()
+    glb.f_log = None
 
 def parse_range_from_tracks(range_str):
     """
@@ -38,55 +42,51 @@ def parse_range_from_tracks(range_str):
         step = (end - start) / (n - 1)
         sorted_values = [start + i * step for i in range(n)]
 
-        result = []
-        mid_index = len(sorted_values) // 2
-        result.append(sorted_values.pop(mid_index))
+        # Middle value first, then the others taken alternately from the low and high ends
+        mid_index = n // 2
+        rest = sorted_values[:mid_index] + sorted_values[mid_index + 1:]
+        half = (len(rest) + 1) // 2
 
-        toggle = True
-        while sorted_values:
-            if toggle:
-                result.append(sorted_values.pop(0))
-            else:
-                result.append(sorted_values.pop(-1))
-            toggle = not toggle
+        result = [sorted_values[mid_index]] * n
+        result[1::2] = rest[:half]
+        result[2::2] = rest[half:][::-1]
 
         return result
 
     tracks = glb.tracks
     w_log(f"Track filter used = {range_str}")
 
-    numbers = []
+    numbers = set()
     if range_str == "*":
         numbers = range(len(tracks))
     else:
         segments = range_str.split(',')
 
         for segment in segments:
-            match = re.match(r'^(\d+)-(\d+)$', segment)
-            if match:
-                start, end = map(int, match.groups())
-                numbers.extend(range(start, end + 1))
-            elif re.match(r'^\d+$', segment):
-                numbers.append(int(segment))
+            if '-' in segment:
+                start, _, end = segment.partition('-')
+                if not (start.isdigit() and end.isdigit()):
+                    raise ValueError(f"Invalid format : {segment}")
+                numbers.update(range(int(start), int(end) + 1))
+            elif segment.isdigit():
+                numbers.add(int(segment))
             else:
                 raise ValueError(f"Invalid format : {segment}")
 
     note_min = 1000
     note_max = 0
     effective_track_count = 0
-    tracks_selected = ""
     list_of_selected_tracks = []
     for track_index, track in enumerate(tracks):
         if track_index not in numbers:
             continue
 
         effective_track_count += 1
-        tracks_selected += (f"{track_index},")
         list_of_selected_tracks.append(track_index)
         note_min = min(note_min, track.min_note)
         note_max = max(note_max, track.max_note)
 
-    tracks_selected = tracks_selected[:-1]
+    tracks_selected = ",".join(map(str, list_of_selected_tracks))
     w_log(f"Track selected are = {tracks_selected}")
 
     octave_count = (note_max // 12) - (note_min // 12) + 1
@@ -102,17 +102,18 @@ def parse_range_from_tracks(range_str):
         tracks_color
     )
 
+# Bits 1, 3, 6, 8 and 10 set, the sharp notes of an octave
+BLACK_KEY_MASK = 0b010101001010
+
 def color_from_note_number(note_number):
     """Define color from note number when sharp (black) or flat (white)"""
-    if note_number in [1, 3, 6, 8, 10]:
+    if (BLACK_KEY_MASK >> note_number) & 1:
         return 0.001  # Black note (almost)
     return 0.01  # White note
 
 def extract_octave_and_note(note_number):
     """Retrieve octave and note_number from note number (0-127)"""
-    octave = note_number // 12
-    note_number = note_number % 12
-    return octave, note_number
+    return divmod(note_number, 12)
 
 def create_compositor_nodes():
     """Creates a Compositor node setup for post-processing effects"""
@@ -120,15 +121,16 @@ def create_compositor_nodes():
     bpy.context.scene.use_nodes = True
     node_tree = bpy.context.scene.node_tree
 
-    # Remove existing nodes
-    for node in node_tree.nodes:
-        node_tree.nodes.remove(node)
+    nodes = node_tree.nodes
+
+    # Remove existing nodes, in a single call
+    nodes.clear()
 
     # Add necessary nodes
-    render_layers_node = node_tree.nodes.new(type='CompositorNodeRLayers')
+    render_layers_node = nodes.new(type='CompositorNodeRLayers')
     render_layers_node.location = (0, 0)
 
-    glare_node = node_tree.nodes.new(type='CompositorNodeGlare')
+    glare_node = nodes.new(type='CompositorNodeGlare')
     glare_node.location = (300, 0)
 
     # Configure the Glare node
@@ -138,7 +140,7 @@ def create_compositor_nodes():
     glare_node.threshold = 5
     glare_node.size = 4
 
-    composite_node = node_tree.nodes.new(type='CompositorNodeComposite')
+    composite_node = nodes.new(type='CompositorNodeComposite')
     composite_node.location = (600, 0)
 
     # Connect the nodes
@@ -149,18 +151,23 @@ def create_compositor_nodes():
 
 def set_blender_units(unit_scale=0.01, length_unit="CENTIMETERS"):
     """Define blender unit system"""
-    bpy.context.scene.unit_settings.system = 'METRIC'
-    bpy.context.scene.unit_settings.system_rotation = 'DEGREES'
-    bpy.context.scene.unit_settings.length_unit = length_unit
-    bpy.context.scene.unit_settings.scale_length = unit_scale
+    unit_settings = bpy.context.scene.unit_settings
+    if (unit_settings.system != 'METRIC'
+            or unit_settings.system_rotation != 'DEGREES'
+            or unit_settings.length_unit != length_unit
+            # scale_length is stored in single precision
+            or abs(unit_settings.scale_length - unit_scale) > 1e-6):
+        unit_settings.system = 'METRIC'
+        unit_settings.system_rotation = 'DEGREES'
+        unit_settings.length_unit = length_unit
+        unit_settings.scale_length = unit_scale
 
     for area in bpy.context.screen.areas:
         if area.type == 'VIEW_3D':
-            for space in area.spaces:
-                if space.type == 'VIEW_3D':
-                    space.overlay.grid_scale = 0.01
-                    space.clip_end = 10000.0
-                    break
+            # The active space of a 3D viewport area is its VIEW_3D space
+            space = area.spaces.active
+            space.overlay.grid_scale = 0.01
+            space.clip_end = 10000.0
 
 def determine_global_ranges():
     """Calculate global note and time ranges across all tracks"""
@@ -172,12 +179,17 @@ def determine_global_ranges():
         'note_mid_range': 0
     }
 
-    for track in glb.tracks:
+    if glb.tracks:
+        # One row per track, columns reduced at once
+        ranges = np.array([
+            (track.min_note, track.max_note, track.notes[0].time_on, track.notes[-1].time_off)
+            for track in glb.tracks
+        ])
         stats.update({
-            'note_min': min(stats['note_min'], track.min_note),
-            'note_max': max(stats['note_max'], track.max_note),
-            'time_min': min(stats['time_min'], track.notes[0].time_on),
-            'time_max': max(stats['time_max'], track.notes[-1].time_off)
+            'note_min': int(ranges[:, 0].min(initial=stats['note_min'])),
+            'note_max': int(ranges[:, 1].max(initial=stats['note_max'])),
+            'time_min': float(ranges[:, 2].min(initial=stats['time_min'])),
+            'time_max': float(ranges[:, 3].max(initial=stats['time_max']))
         })
 
     stats['note_mid_range'] = stats['note_min'] + (stats['note_max'] - stats['note_min']) / 2
@@ -214,10 +226,13 @@ def load_audio(audio_path_str):
         w_log("Error: sequence_editor could not be created.")
         return
 
-    # Clear previous strips (optional, depending on your logic)
-    seq_editor_clear = getattr(seq_editor, "clear", None)
-    if callable(seq_editor_clear):
-        seq_editor.clear()
+    # Keep the strip of a previous run when it is the same file, avoids decoding it again
+    audio_path_abs = bpy.path.abspath(audio_path_str)
+    for strip in seq_editor.sequences_all:
+        if (strip.type == 'SOUND' and strip.channel == 1 and strip.frame_start == 0
+                and bpy.path.abspath(strip.sound.filepath) == audio_path_abs):
+            w_log(f"Audio file already in VSE: {audio_path_str}")
+            return
 
     # Add the sound strip directly
     seq_editor.sequences.new_sound(
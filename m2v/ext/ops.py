@@ -7,6 +7,7 @@ the final animation based on user-selected parameters.
 """
 from time import time
 from math import ceil
+import threading
 import bpy # type: ignore  # pylint: disable=import-error
 from ..engine.globals import glb
 from ..engine.utils.stuff import init_log, w_log, end_log, create_compositor_nodes, determine_global_ranges, load_audio
@@ -25,18 +26,87 @@ class OT_GenerateAnimation(bpy.types.Operator):
     bl_idname = "scene.m2v_generate_animation"
     bl_label = "Generate Animation"
 
+    # Set while a generation started by invoke waits for its MIDI file
+    _running = False
+
     @classmethod
     def poll(cls, context):
         """
         Poll function to check if the operator can be executed.
         """
-        # Check if we're in Object mode and in a 3D Viewport area
+        # Check if we're in Object mode and in a 3D Viewport area, with no generation running
         return (
-            context.mode == 'OBJECT'
+            not cls._running
+            and context.mode == 'OBJECT'
             and context.area is not None
             and context.area.type == 'VIEW_3D'
         )
 
+    def invoke(self, context, event):
+        """
+        Interactive entry point: the MIDI file is read in a background thread, then modal
+        prepares the scene and generates the animation once the file is parsed, so the
+        UI is not frozen by the parsing.
+        Only read_midi_file (pure Python, no Blender API) runs in the thread,
+        every Blender call stays on the main thread.
+        """
+        paths = self.get_paths(context.scene.m2b)
+        self._paths = paths
+        self._time_start = time()
+        self._midi_result = None
+        self._midi_error = None
+        self._thread = threading.Thread(target=self.read_midi, args=(paths["midi"],),
+                                        daemon=True)
+        self._thread.start()
+        OT_GenerateAnimation._running = True
+
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(0.1, window=context.window)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        """
+        Wait for the MIDI parsing thread, then prepare the scene and generate the animation.
+        The UI stays usable meanwhile, Esc cancels the generation.
+        """
+        if event.type == 'ESC':
+            # The thread cannot be stopped, its result is dropped
+            self.cancel(context)
+            self._midi_result = None
+            self.report({'INFO'}, "Animation generation cancelled")
+            return {'CANCELLED'}
+
+        if self._thread.is_alive():
+            return {'PASS_THROUGH'}
+
+        context.window_manager.event_timer_remove(self._timer)
+        self._timer = None
+
+        try:
+            if self._midi_error is not None:
+                raise self._midi_error
+            self.prepare(context, self._paths)
+            self.finish(context, self._midi_result, self._time_start)
+            self.report({'INFO'}, "Animation generated successfully")
+            return {'FINISHED'}
+        except Exception as e:
+            self.report({'ERROR'}, f"Error: {str(e)}")
+            return {'CANCELLED'}
+        finally:
+            end_log()
+            OT_GenerateAnimation._running = False
+
+    def cancel(self, context):
+        """
+        Called by Blender when the modal operator is stopped (file load, window closed),
+        the operator must be available again.
+        """
+        if self._timer is not None:
+            context.window_manager.event_timer_remove(self._timer)
+            self._timer = None
+        OT_GenerateAnimation._running = False
+
     def execute(self, context):
         """
         Executes the main MIDI to Blender (m2v) animation generation process.
@@ -48,51 +118,78 @@ class OT_GenerateAnimation(bpy.types.Operator):
         5. Determines global ranges for notes
         6. Generates animation based on specified parameters
         7. Sets up compositor nodes
+        Used when the operator is run without invoke (scripts), in one blocking call.
         """
+        paths = self.get_paths(context.scene.m2b)
+
+        try:
+            time_start = time()
+            self.prepare(context, paths)
+            self.finish(context, read_midi_file(paths["midi"]), time_start)
 
-        scene = context.scene
-        m2b = scene.m2b
+            self.report({'INFO'}, "Animation generated successfully")
+            return {'FINISHED'}
+        except Exception as e:
+            self.report({'ERROR'}, f"Error: {str(e)}")
+            return {'CANCELLED'}
+        finally:
+            # Also flushes the log of a failed run
+            end_log()
 
-        # Initialize
-        paths = {
+    @staticmethod
+    def get_paths(m2b):
+        """
+        Files used by the generation, from the addon properties.
+        """
+        return {
             "midi": m2b.midi_file,
             "audio": m2b.audio_file,
             "log": m2b.midi_file + ".log"
         }
 
+    def read_midi(self, midi_path):
+        """
+        Thread target, keeps the result or the error for modal.
+        """
         try:
-            time_start = time()
-
-            # Core M2V logic
-            init_log(paths["log"])
-            init_collections()
-            init_materials()
-            glb.fps = scene.render.fps
+            self._midi_result = read_midi_file(midi_path)
+        except Exception as e:
+            self._midi_error = e
 
-            load_audio(paths["audio"])
+    @staticmethod
+    def prepare(context, paths):
+        """
+        Scene setup that does not depend on the MIDI file:
+        log, collections, materials and audio.
+        """
+        init_log(paths["log"])
+        init_collections()
+        init_materials()
+        glb.fps = context.scene.render.fps
 
-            midi_file, _, glb.tracks = read_midi_file(paths["midi"])
+        load_audio(paths["audio"])
 
-            w_log(f"Midi type = {midi_file.midi_format}")
-            w_log(f"animation type = {m2b.animation_type}")
-            w_log(f"track mask = {m2b.track_mask}")
-            w_log(f"animation style = {m2b.animation_style}")
+    @staticmethod
+    def finish(context, midi_result, time_start):
+        """
+        Generate the animation from the parsed MIDI file and set up the compositor.
+        """
+        m2b = context.scene.m2b
+        midi_file, _, glb.tracks = midi_result
 
-            (_, _, _, glb.last_note_time_off,
-            note_mid_range_all_tracks) = determine_global_ranges()
+        w_log(f"Midi type = {midi_file.midi_format}")
+        w_log(f"animation type = {m2b.animation_type}")
+        w_log(f"track mask = {m2b.track_mask}")
+        w_log(f"animation style = {m2b.animation_style}")
 
-            w_log(f"Note mid range for all tracks: {note_mid_range_all_tracks}")
+        (_, _, _, glb.last_note_time_off,
+        note_mid_range_all_tracks) = determine_global_ranges()
 
-            animate(m2b.animation_type, m2b.track_mask, m2b.animation_style)
+        w_log(f"Note mid range for all tracks: {note_mid_range_all_tracks}")
 
-            bpy.context.scene.frame_end = ceil(glb.last_note_time_off + 5) * glb.fps
-            create_compositor_nodes()
+        animate(m2b.animation_type, m2b.track_mask, m2b.animation_style)
 
-            w_log(f"Script Finished: {time() - time_start:.2f} sec")
-            end_log()
+        bpy.context.scene.frame_end = ceil(glb.last_note_time_off + 5) * glb.fps
+        create_compositor_nodes()
 
-            self.report({'INFO'}, "Animation generated successfully")
-            return {'FINISHED'}
-        except Exception as e:
-            self.report({'ERROR'}, f"Error: {str(e)}")
-            return {'CANCELLED'}
+        w_log(f"Script Finished: {time() - time_start:.2f} sec")
@@ -3,68 +3,107 @@ Main panel for M2V (MIDI to Visuals) addon implementation.
 This class creates and manages the main panel interface for the MIDI to Visuals (M2V) addon extension in Blender.
 """
 import os
+import re
+import sys
+from operator import attrgetter
+from types import MappingProxyType
 import bpy  # type: ignore  # pylint: disable=import-error
-from bpy_extras.io_utils import ImportHelper # type: ignore  # pylint: disable=import-error
+
+# Addon properties of the current scene
+_get_m2b = attrgetter("scene.m2b")
+
+# Items are built once as tuples held by the module: Blender requires Python to keep
+# a reference to the strings returned by an enum items callback.
+def _enum_items(*items):
+    """Freeze enum items, with interned strings."""
+    return tuple(tuple(sys.intern(text) for text in item) for item in items)
+
+_ANIMATION_TYPES = _enum_items(
+    ('barGraph', "Bar Graph", "Bar graph visualization"),
+    ('stripNotes', "Strip Notes", "Strip notes visualization"),
+    ('waterFall', "Waterfall", "Waterfall visualization"),
+    ('fireworksV1', "Fireworks V1", "Fireworks version 1"),
+    ('fireworksV2', "Fireworks V2", "Fireworks version 2"),
+    ('fountain', "Fountain", "Fountain visualization"),
+    ('lightShow', "Light Show", "Light show visualization"),
+)
 
 # Define animation style from animation type
-animation_styles = {
-    'barGraph': [
-        ('ZSCALE', "Z-Scale", "Scale on Z axis"),
-        ('B2R_LIGHT', "Blue to Red Light", "Color gradient from blue to red"),
-        ('MULTILIGHT', "Multi light", "Light colors are same as base colors"),
-    ],
-    'stripNotes': [
-        ('ZSCALE', "Z-Scale", "Scale on Z axis"),
-        ('B2R_LIGHT', "Blue to Red Light", "Color gradient from blue to red"),
-        ('MULTILIGHT', "Multi light", "Light colors are same as base colors"),
-    ],
-    'waterFall': [
-        ('ZSCALE', "Z-Scale", "Scale on Z axis"),
-        ('B2R_LIGHT', "Blue to Red Light", "Color gradient from blue to red"),
-        ('MULTILIGHT', "Multi light", "Light colors are same as base colors"),
-    ],
-    'lightShow': [
+_SCALE_AND_LIGHT_STYLES = _enum_items(
+    ('ZSCALE', "Z-Scale", "Scale on Z axis"),
+    ('B2R_LIGHT', "Blue to Red Light", "Color gradient from blue to red"),
+    ('MULTILIGHT', "Multi light", "Light colors are same as base colors"),
+)
+_SPREAD_STYLES = _enum_items(
+    ('SPREAD', "spread mode", "spread mode"),
+)
+_NO_STYLES = ()
+
+# Read-only, the items must not change once handed to Blender
+animation_styles = MappingProxyType({
+    'barGraph': _SCALE_AND_LIGHT_STYLES,
+    'stripNotes': _SCALE_AND_LIGHT_STYLES,
+    'waterFall': _SCALE_AND_LIGHT_STYLES,
+    'lightShow': _enum_items(
         ('EEVEE', "EEVEE rendering", "For EEVEE rendering"),
         ('CYCLE', "Cycle rendering", "For CYCLES rendering"),
-    ],
-    'fountain': [
+    ),
+    'fountain': _enum_items(
         ('FOUNTAIN', "fountain mode", "fountain mode"),
-    ],
-    'fireworksV1': [
-        ('SPREAD', "spread mode", "spread mode"),
-    ],
-    'fireworksV2': [
-        ('SPREAD', "spread mode", "spread mode"),
-    ],
+    ),
+    'fireworksV1': _SPREAD_STYLES,
+    'fireworksV2': _SPREAD_STYLES,
     # Add other animation types and their styles here
+})
+
+# Style ids and default style of each animation type, for update_animation_style
+_animation_style_ids = {
+    anim_type: frozenset(style[0] for style in styles)
+    for anim_type, styles in animation_styles.items()
+}
+_NO_STYLE_IDS = frozenset()
+_animation_style_first = {
+    anim_type: styles[0][0] if styles else ""
+    for anim_type, styles in animation_styles.items()
 }
 
 def get_animation_styles(self, context):
     """Return the list of styles based on the current animation type."""
-    m2b = context.scene.m2b
-    current_type = m2b.animation_type
-    return animation_styles.get(current_type, [])
+    current_type = self.animation_type
+    return animation_styles.get(current_type, _NO_STYLES)
 
 def update_animation_style(self, context):
     """Callback to update animation style from type"""
-    m2b = context.scene.m2b
-    current_type = m2b.animation_type
-    styles = animation_styles.get(current_type, [])
+    current_type = self.animation_type
 
     # Reset animation style if not in the list of styles
-    if m2b.animation_style not in [style[0] for style in styles]:
-        m2b.animation_style = styles[0][0] if styles else ""
+    if self.animation_style not in _animation_style_ids.get(current_type, _NO_STYLE_IDS):
+        self.animation_style = _animation_style_first.get(current_type, "")
 
 def update_midi_file(self, context):
     """Callback to update midi file"""
-    m2b = context.scene.m2b
-    current_midi_file = m2b.midi_file
-    name_without_ext = os.path.splitext(current_midi_file)[0]
-    current_audio_file = name_without_ext + ".mp3"
-    if os.path.exists(current_audio_file):
-        m2b.audio_file = current_audio_file
+    current_midi_file = self.midi_file
+
+    # String work only, whether the audio file exists is checked when drawing
+    # The file browser only offers *.mid files, strip that suffix directly
+    if current_midi_file.endswith(".mid"):
+        name_without_ext = current_midi_file[:-4]
     else:
-        m2b.audio_file = ""
+        name_without_ext = os.path.splitext(current_midi_file)[0]
+    current_audio_file = name_without_ext + ".mp3"
+
+    # Each property write notifies the UI, skip it when nothing changes
+    if self.audio_file != current_audio_file:
+        self.audio_file = current_audio_file
+
+# Same syntax as accepted by parse_range_from_tracks, "*" or "0-5,7,9-12"
+_TRACK_MASK_RE = re.compile(r'\*|\d+(-\d+)?(,\d+(-\d+)?)*')
+
+def update_track_mask(self, context):
+    """Callback to validate the track selection pattern as it is typed"""
+    track_mask_valid = _TRACK_MASK_RE.fullmatch(self.track_mask) is not None
+    if self.track_mask_valid != track_mask_valid:
+        self.track_mask_valid = track_mask_valid
 
 class M2V_Properties(bpy.types.PropertyGroup):
     """Properties for M2V add-on"""
@@ -87,15 +126,7 @@ class M2V_Properties(bpy.types.PropertyGroup):
     animation_type: bpy.props.EnumProperty(
         name="Type",
         description="Type of animation to generate",
-        items=[
-            ('barGraph', "Bar Graph", "Bar graph visualization"),
-            ('stripNotes', "Strip Notes", "Strip notes visualization"),
-            ('waterFall', "Waterfall", "Waterfall visualization"),
-            ('fireworksV1', "Fireworks V1", "Fireworks version 1"),
-            ('fireworksV2', "Fireworks V2", "Fireworks version 2"),
-            ('fountain', "Fountain", "Fountain visualization"),
-            ('lightShow', "Light Show", "Light show visualization")
-        ],
+        items=_ANIMATION_TYPES,
         default='barGraph',
         update=update_animation_style
     )
@@ -109,25 +140,51 @@ class M2V_Properties(bpy.types.PropertyGroup):
     track_mask: bpy.props.StringProperty(
         name="Track Selection",
         description="Track selection pattern (e.g. '0-5,7,9-12' or '*' for all)",
-        default="*"
+        default="*",
+        update=update_track_mask
+    )
+
+    track_mask_valid: bpy.props.BoolProperty(
+        name="Track Selection Valid",
+        description="Whether track_mask follows the track selection syntax",
+        default=True,
+        options={'HIDDEN', 'SKIP_SAVE'}
     )
 
-class OT_OpenMidiFile(bpy.types.Operator, ImportHelper):
+class OT_OpenMidiFile(bpy.types.Operator):
     """Operator Type = Open MIDI File"""
     bl_idname = "wm.open_midi_file"
     bl_label = "Open MIDI File"
     bl_options = {'REGISTER', 'UNDO'}
 
+    # The file browser part of ImportHelper, without importing bpy_extras at addon load
+    filepath: bpy.props.StringProperty(
+        subtype='FILE_PATH',
+        options={'SKIP_SAVE'}
+    )
+
     filter_glob: bpy.props.StringProperty(
         default="*.mid",
         options={'HIDDEN'}
     )
 
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
     def execute(self, context):
-        m2b = context.scene.m2b
-        m2b.midi_file = self.filepath
+        m2b = _get_m2b(context)
+        # Selecting the same file again must not fire update_midi_file
+        if m2b.midi_file != self.filepath:
+            m2b.midi_file = self.filepath
         return {'FINISHED'}
 
+# Draw plan of PT_MainPanel
+_OP_OPEN = "wm.open_midi_file"
+_OP_GEN = "scene.m2v_generate_animation"
+_ANIMATION_PROPS = ("animation_type", "animation_style", "track_mask")
+_ANIMATION_PROPS_NO_STYLE = ("animation_type", "track_mask")
+
 class PT_MainPanel(bpy.types.Panel):
     """
     Panel Type = Main panel for M2V (MIDI to Blender) addon.
@@ -143,18 +200,26 @@ class PT_MainPanel(bpy.types.Panel):
     def draw(self, context):
         """Draw the main M2V panel layout in Blender."""
         layout = self.layout
-        m2b = context.scene.m2b
+        m2b = _get_m2b(context)
 
         box = layout.box()
         box.label(text="MIDI File:")
-        box.operator("wm.open_midi_file")
+        box.operator(_OP_OPEN)
         box.prop(m2b, "audio_file")
+        # A single stat, so a file copied or removed meanwhile is seen on the next redraw
+        if m2b.audio_file and not os.path.isfile(bpy.path.abspath(m2b.audio_file)):
+            box.label(text="Audio file not found", icon='ERROR')
 
         box = layout.box()
-        box.prop(m2b, "animation_type")
-        box.prop(m2b, "animation_style")
-        box.prop(m2b, "track_mask")
+        if animation_styles.get(m2b.animation_type):
+            animation_props = _ANIMATION_PROPS
+        else:
+            animation_props = _ANIMATION_PROPS_NO_STYLE
+        for prop_name in animation_props:
+            box.prop(m2b, prop_name)
+        if not m2b.track_mask_valid:
+            box.label(text="Invalid track selection", icon='ERROR')
 
         row = layout.row()
         row.scale_y = 2.0
-        row.operator("scene.m2v_generate_animation")
+        row.operator(_OP_GEN)
@@ -0,0 +1,227 @@
+"""
+Checks read_midi_file, which streams events with stream_events, against the event
+parser (MIDIFile.from_file + TempoMap) on generated format 0 and format 1 files.
+The midi module does not depend on bpy, it is loaded from its path so the addon
+package (and Blender) is not imported.
+"""
+import importlib.util
+import os
+import random
+import struct
+import sys
+import tempfile
+import unittest
+
+MIDI_PATH = os.path.join(os.path.dirname(__file__), os.pardir, "m2v", "engine", "utils", "midi.py")
+
+def load_midi_module():
+    spec = importlib.util.spec_from_file_location("m2v_midi", MIDI_PATH)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+midi = load_midi_module()
+
+###############################################################################
+#                              MIDI file writer                               #
+###############################################################################
+
+def vlq(value):
+    out = [value & 0x7F]
+    value >>= 7
+    while value:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    return bytes(reversed(out))
+
+def meta(event_type, data):
+    return b"\xff" + bytes([event_type]) + vlq(len(data)) + data
+
+def chunk(identifier, body):
+    return identifier + struct.pack(">I", len(body)) + body
+
+def track_chunk(events):
+    body = b"".join(vlq(delta_time) + data for delta_time, data in events)
+    return chunk(b"MTrk", body + vlq(0) + meta(0x2F, b""))
+
+def note_events(rng, channels, notes_count):
+    """
+    Random notes with running status, Note On with zero velocity as Note Off,
+    overlapping notes on the same key and events read_midi_file ignores.
+    """
+    events = []
+    pending = []
+    last_status = None
+    for _ in range(notes_count):
+        channel = rng.choice(channels)
+        note = rng.randint(20, 100)
+        status = 0x90 | channel
+        data = bytes([note, rng.randint(1, 127)])
+        if status != last_status or rng.random() < 0.5:
+            data = bytes([status]) + data
+        events.append((rng.randint(0, 200), data))
+        last_status = status
+        if rng.random() < 0.2:
+            events.append((rng.randint(0, 50), bytes([0xB0 | channel, 7, rng.randint(0, 127)])))
+            last_status = 0xB0 | channel
+        if rng.random() < 0.05:
+            events.append((0, bytes([0xE0 | channel, 0, 64])))
+            last_status = 0xE0 | channel
+        if rng.random() < 0.05:
+            events.append((0, bytes([0xC0 | channel, 5])))
+            last_status = 0xC0 | channel
+        if rng.random() < 0.05:
+            events.append((0, meta(0x01, b"text")))
+            last_status = None
+        pending.append((channel, note))
+        if rng.random() < 0.7 or len(pending) > 6:
+            channel, note = pending.pop(rng.randrange(len(pending)))
+            if rng.random() < 0.5:
+                events.append((rng.randint(1, 300), bytes([0x80 | channel, note, 64])))
+                last_status = 0x80 | channel
+            else:
+                events.append((rng.randint(1, 300), bytes([0x90 | channel, note, 0])))
+                last_status = 0x90 | channel
+    for channel, note in pending:
+        events.append((rng.randint(1, 100), bytes([0x80 | channel, note, 0])))
+    return events
+
+def make_midi_file(seed, midi_format, tracks_count, notes_count):
+    rng = random.Random(seed)
+    chunks = []
+    if midi_format == 1:
+        events = [(0, meta(0x51, (500_000).to_bytes(3, "big"))),
+                  (0, meta(0x58, bytes([4, 2, 24, 8]))),
+                  (0, meta(0x03, b"Conductor"))]
+        for _ in range(5):
+            events.append((rng.randint(100, 2000),
+                           meta(0x51, rng.randint(300_000, 800_000).to_bytes(3, "big"))))
+        chunks.append(track_chunk(events))
+    for track_index in range(tracks_count):
+        events = [(0, meta(0x03, f"Track {track_index} \xe9".encode("latin-1"))),
+                  (0, meta(0x04, b"Piano")),
+                  (0, b"\xf0" + vlq(3) + b"\x01\x02\xf7")]
+        if midi_format == 0:
+            events.insert(0, (0, meta(0x51, (600_000).to_bytes(3, "big"))))
+            events.append((480, meta(0x51, (400_000).to_bytes(3, "big"))))
+            channels = list(range(16))
+        else:
+            channels = [track_index % 16, (track_index + 1) % 16]
+        events.extend(note_events(rng, channels, notes_count))
+        chunks.append(track_chunk(events))
+        # Chunks other than MTrk must be skipped
+        if track_index == 0:
+            chunks.append(chunk(b"XFIH", b"\x00" * 7))
+    header = chunk(b"MThd", struct.pack(">HHH", midi_format, tracks_count + (midi_format == 1), 480))
+    return header + b"".join(chunks)
+
+###############################################################################
+#                      Reference from the parsed events                       #
+###############################################################################
+
+def reference_read(path):
+    """
+    Notes and ranges of each track, computed from MIDIFile.from_file events
+    the way read_midi_file did before events were streamed.
+    """
+    midi_file = midi.MIDIFile.from_file(path)
+    tempo_map = midi.TempoMap(midi_file)
+    file_tracks = midi_file.tracks[1:] if midi_file.midi_format == 1 else midi_file.tracks
+    tracks = []
+    for track_index, track in enumerate(file_tracks):
+        time_in_ticks = 0
+        name = ""
+        pending = {}
+        notes = []
+        notes_used = set()
+        velocities = []
+        for event in track.events:
+            time_in_ticks += event.delta_time
+            if isinstance(event, midi.TrackNameEvent):
+                name = event.name
+            elif isinstance(event, midi.NoteOnEvent):
+                key = (event.channel, event.note)
+                if key in pending:
+                    pending[key][2] += 1
+                else:
+                    pending[key] = [time_in_ticks, event.velocity / 127, 1]
+                notes_used.add(event.note)
+                velocities.append(event.velocity)
+            elif isinstance(event, midi.NoteOffEvent):
+                record = pending.get((event.channel, event.note))
+                if record is None:
+                    continue
+                if record[2] > 1:
+                    record[2] -= 1
+                    continue
+                del pending[(event.channel, event.note)]
+                notes.append((event.channel, event.note,
+                              tempo_map.time_in_ticks_to_seconds(track_index, record[0]),
+                              tempo_map.time_in_ticks_to_seconds(track_index, time_in_ticks),
+                              record[1]))
+        if notes_used:
+            tracks.append((name, notes, sorted(notes_used), min(notes_used), max(notes_used),
+                           min(velocities), max(velocities)))
+
+    if midi_file.midi_format == 0:
+        name, notes = tracks[0][:2]
+        tracks = []
+        for channel in range(16):
+            channel_notes = [note for note in notes if note[0] == channel]
+            if not channel_notes:
+                continue
+            numbers = [note[1] for note in channel_notes]
+            velocities = [note[4] for note in channel_notes]
+            tracks.append((f"{name}-ch{channel}", channel_notes, sorted(set(numbers)),
+                           min(numbers), max(numbers), min(velocities), max(velocities)))
+    return midi_file, tempo_map, tracks
+
+def streamed_read(path):
+    midi_file, tempo_map, tracks = midi.read_midi_file(path)
+    return midi_file, tempo_map, [
+        (track.name,
+         [(note.channel, note.note_number, note.time_on, note.time_off, note.velocity)
+          for note in track.notes],
+         track.notes_used, track.min_note, track.max_note, track.min_velo, track.max_velo)
+        for track in tracks
+    ]
+
+class ReadMidiFileTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def check_file(self, seed, midi_format, tracks_count, notes_count):
+        path = os.path.join(self.directory.name, f"{seed}.mid")
+        with open(path, "wb") as f:
+            f.write(make_midi_file(seed, midi_format, tracks_count, notes_count))
+
+        expected_file, expected_tempo_map, expected_tracks = reference_read(path)
+        midi_file, tempo_map, tracks = streamed_read(path)
+
+        self.assertEqual(midi_file.midi_format, expected_file.midi_format)
+        self.assertEqual(midi_file.ppqn, expected_file.ppqn)
+        self.assertEqual(
+            [[(record.time_in_ticks, record.tempo) for record in records]
+             for records in tempo_map.tempo_tracks],
+            [[(record.time_in_ticks, record.tempo) for record in records]
+             for records in expected_tempo_map.tempo_tracks])
+        self.assertEqual(len(tracks), len(expected_tracks))
+        for track, expected_track in zip(tracks, expected_tracks):
+            self.assertEqual(track, expected_track)
+
+    def test_format_0(self):
+        for seed in range(5):
+            with self.subTest(seed=seed):
+                self.check_file(seed, 0, 1, 400)
+
+    def test_format_1(self):
+        for seed in range(5):
+            with self.subTest(seed=seed):
+                self.check_file(100 + seed, 1, 6, 200)
+
+if __name__ == "__main__":
+    unittest.main()